@@ -1,121 +1,155 @@
 import pyb
-import time
-import struct
+import gc
+import math
+from array import array
+import micropython
 import uasyncio  # Import the asynchronous I/O library
 
+from mpu6050 import MPU6050  # Shared driver (frozen into the firmware)
 
-# --- 1. MPU-6050 Driver (No changes needed) ---
-class MPU6050:
-    DEFAULT_ADDR = 0x68
-    REG_PWR_MGMT_1 = 0x6B
-    REG_ACCEL_X_H = 0x3B
-    SCALE_ACCEL = 16384.0
-    SCALE_GYRO = 131.0
-
-    def __init__(self, i2c_bus, addr=DEFAULT_ADDR):
-        self.i2c = i2c_bus
-        self.addr = addr
-        self._buffer = bytearray(14)
-        try:
-            self.i2c.writeto_mem(self.addr, self.REG_PWR_MGMT_1, b"\x00")
-            time.sleep_ms(100)  # Sync sleep is OK in init
-        except OSError as e:
-            print(f"Failed to init MPU6050: {e}")
-            raise
-
-    def get_all_data_scaled(self):
-        try:
-            # This is still a synchronous (blocking) I2C read
-            self.i2c.readfrom_mem_into(self.addr, self.REG_ACCEL_X_H, self._buffer)
-            ax_r, ay_r, az_r, t_r, gx_r, gy_r, gz_r = struct.unpack(
-                ">hhhhhhh", self._buffer
-            )
-
-            ax = ax_r / self.SCALE_ACCEL
-            ay = ay_r / self.SCALE_ACCEL
-            az = az_r / self.SCALE_ACCEL
-            temp_c = (t_r / 340.0) + 36.53
-            gx = gx_r / self.SCALE_GYRO
-            gy = gy_r / self.SCALE_GYRO
-            gz = gz_r / self.SCALE_GYRO
+try:
+    from ulab import numpy as np  # Only on firmwares built with ulab
+except ImportError:
+    np = None
 
-            return (ax, ay, az, temp_c, gx, gy, gz)
-        except OSError as e:
-            print(f"I2C Error: {e}")
-            return (0, 0, 0, 0, 0, 0, 0)
 
+# --- 1. Helper Functions ---
+# These functions do the CPU-work of getting the data. Instead of building
+# a new dict on every read, both write their (accel_x, accel_y, accel_z)
+# into one shared buffer, laid out as [ix, iy, iz, ex, ey, ez]:
+# internal sensor at offset 0, external sensor at offset 3.
 
-# --- 2. Synchronous Helper Functions (No changes needed) ---
-# These functions do the CPU-work of getting and packing data.
+_scratch = array("f", [0.0] * 6)
 
 
-def externalAcelerometers(sensor_device):
+async def get_external_data_async(sensor_device, out=_scratch, off=3):
+    # sensor_device is the MPU6050 or an AccelWindow over it
     if not sensor_device:
         return None
-    ax, ay, az, temp_c, gx, gy, gz = sensor_device.get_all_data_scaled()
-    return {
-        "accel_x": ax,
-        "accel_y": ay,
-        "accel_z": az,
-        "gyro_x": gx,
-        "gyro_y": gy,
-        "gyro_z": gz,
-        "temp_c": temp_c,
-    }
-
-
-def getInternalAccelerometerData(accel_obj, has_filtered_method):
-    if not accel_obj:
-        return None
-    if has_filtered_method:
-        x, y, z = accel_obj.filtered_xyz()  # Blocking read
-        units = "g-force"
-    else:
-        x, y, z = accel_obj.xyz()  # Blocking read
-        units = "raw"
-    return {"accel_x": x, "accel_y": y, "accel_z": z, "units": units}
+    data = await sensor_device.get_all_data_scaled_async()
+    out[off] = data[0]
+    out[off + 1] = data[1]
+    out[off + 2] = data[2]
+    return out
 
 
-# --- 3. Asynchronous Wrapper Functions (NEW) ---
-# These functions call the synchronous code and then yield control.
-
-
-async def get_internal_data_async(accel_obj, has_filtered_method):
-    """Async wrapper for the internal accelerometer read."""
-    data = getInternalAccelerometerData(accel_obj, has_filtered_method)
-    await uasyncio.sleep_ms(0)  # Yield to the scheduler
-    return data
-
-
-async def get_external_data_async(sensor_device):
-    """Async wrapper for the external accelerometer read."""
-    data = externalAcelerometers(sensor_device)
-    await uasyncio.sleep_ms(0)  # Yield to the scheduler
-    return data
+def getInternalAccelerometerData(read_xyz, out=_scratch, off=0):
+    # read_xyz is the board's reader, picked once at startup
+    # (accel.filtered_xyz, g-force, on the float fusion path)
+    if not read_xyz:
+        return None
+    x, y, z = read_xyz()  # Blocking read
+    out[off] = x
+    out[off + 1] = y
+    out[off + 2] = z
+    return out
+
+
+# --- 2. Windowed External Readings (ulab) ---
+# Instead of one sample per fusion cycle, a background task keeps the last
+# ACCEL_WINDOW raw bursts in a ring, and the fusion cycle averages the whole
+# window in a single vectorized ulab operation.
+
+ACCEL_WINDOW = 8  # Samples per fused output (1 = no windowing)
+
+_INV_SCALE_ACCEL = 1.0 / MPU6050.SCALE_ACCEL  # Raw counts -> g
+
+
+class AccelWindow:
+    """Ring of the last n raw MPU-6050 bursts, averaged with ulab."""
+
+    def __init__(self, mpu, n):
+        self.mpu = mpu
+        self.n = n
+        self._ring = array("h", [0] * 7 * n)
+        mv = memoryview(self._ring)
+        # One 14-byte slot per sample, sliced once (no per-read allocation)
+        self._slots = [mv[i * 7 : i * 7 + 7] for i in range(n)]
+        self._i = 0
+        self._out = array("f", [0] * 3)
+        for slot in self._slots:  # Pre-fill so the first mean is valid
+            mpu.read_raw_into(slot)
+
+    async def run(self, period_ms):
+        """Sampler task: one burst per data-ready (or every period_ms)."""
+        while True:
+            if self.mpu.has_int_pin:
+                await self.mpu.wait_data_ready()
+            else:
+                await uasyncio.sleep_ms(period_ms)
+            try:
+                self.mpu.read_raw_into(self._slots[self._i])
+            except OSError as e:
+                print(f"I2C Error reading sensor: {e}")
+                continue
+            self._i = (self._i + 1) % self.n
+
+    async def get_all_data_scaled_async(self):
+        """
+        Mean (ax, ay, az) in g over the window, so this object can stand in
+        for the MPU6050 in get_averaged_accel_data_async().
+        """
+        await uasyncio.sleep_ms(0)
+        # The sensor words are big-endian; the MCU is little-endian
+        a = np.frombuffer(self._ring, dtype=np.int16).byteswap()
+        a = a.reshape((self.n, 7))
+        m = np.mean(a[:, 0:3], axis=0) * _INV_SCALE_ACCEL
+        out = self._out
+        out[0] = m[0]
+        out[1] = m[1]
+        out[2] = m[2]
+        return out
+
+
+# --- 3. Asynchronous Fusion Function ---
+
+# Float path for Pyboard D-series (g-force internal accelerometer).
+NORMALIZATION_RANGE_G = 2.0
 
+# Normalization and the 2-sensor average folded into one multiply per value:
+# (a / range + b / range) / 2 == a * (0.5 / range) + b * (0.5 / range)
+_INV_NORM_G = 1.0 / NORMALIZATION_RANGE_G
+_INV_AVG_G = 0.5 * _INV_NORM_G  # 0.25
 
-# --- 4. Refactored Asynchronous Fusion Function (NEW) ---
 
-NORMALIZATION_RANGE_G = 2.0
-NORMALIZATION_RANGE_V1_RAW = 32.0
+@micropython.native
+def _fuse(buf, inv_int, inv_ext):
+    """
+    Averages both sensors' axes (buf = [ix, iy, iz, ex, ey, ez]) and
+    scales the result to a unit vector (divides by its Euclidean length),
+    so motion over the range is not clipped per axis. inv_int / inv_ext
+    already include the 1/2 of the average. Returns (0, 0, 0) for a
+    zero-length vector.
+    Compiled to native code: straight-line arithmetic, no bytecode dispatch.
+    """
+    ax = buf[0] * inv_int + buf[3] * inv_ext
+    ay = buf[1] * inv_int + buf[4] * inv_ext
+    az = buf[2] * inv_int + buf[5] * inv_ext
+    mag = ax * ax + ay * ay + az * az
+    inv = 1.0 / math.sqrt(mag) if mag > 1e-9 else 0.0
+    return (ax * inv, ay * inv, az * inv)
 
 
 async def get_averaged_accel_data_async(
-    internal_obj, internal_has_filter, external_obj
+    internal_read, int_inv_norm, external_obj, ext_inv_norm
 ):
     """
-    Fetches data from both sensors concurrently, normalizes,
-    and returns the average.
+    Reads both sensors, normalizes, and returns the average
+    as an (x, y, z) tuple, or None on a read error.
+    external_obj is the MPU6050 or an AccelWindow over it.
+    int_inv_norm / ext_inv_norm are the per-sensor factors (normalization
+    and the 1/2 of the average folded together), bound once in main().
     """
 
-    # 1. Schedule both tasks to run concurrently
-    # uasyncio.gather() runs both coroutines.
-    # The 'await' pauses this function until *both* are complete.
+    # 1. Read both sensors back-to-back.
+    # The external read waits (yielding) for the MPU-6050 data-ready IRQ;
+    # the transfers themselves still block the CPU, so running them as
+    # separate gathered tasks would only add scheduler overhead.
+    # Both land in the shared _scratch buffer: [ix, iy, iz, ex, ey, ez]
+    buf = _scratch
     try:
-        int_data, ext_data = await uasyncio.gather(
-            get_internal_data_async(internal_obj, internal_has_filter),
-            get_external_data_async(external_obj),
-        )
+        ext_data = await get_external_data_async(external_obj, buf, 3)
+        int_data = getInternalAccelerometerData(internal_read, buf, 0)
     except OSError as e:
         print(f"Sensor read error: {e}")
         return None
@@ -124,30 +158,60 @@ async def get_averaged_accel_data_async(
         print("Error reading one or more sensors.")
         return None
 
-    # 2. Normalize Internal Sensor Data (This part is fast)
-    int_norm_factor = (
-        NORMALIZATION_RANGE_G
-        if int_data["units"] == "g-force"
-        else NORMALIZATION_RANGE_V1_RAW
-    )
-    int_norm_x = int_data["accel_x"] / int_norm_factor
-    int_norm_y = int_data["accel_y"] / int_norm_factor
-    int_norm_z = int_data["accel_z"] / int_norm_factor
-
-    # 3. Normalize External Sensor Data
-    ext_norm_x = ext_data["accel_x"] / NORMALIZATION_RANGE_G
-    ext_norm_y = ext_data["accel_y"] / NORMALIZATION_RANGE_G
-    ext_norm_z = ext_data["accel_z"] / NORMALIZATION_RANGE_G
+    # 2. Normalize, Average and scale to unit length (native code)
+    return _fuse(buf, int_inv_norm, ext_inv_norm)
+
+
+# Fixed-point path for Pyboard v1.x (raw integer internal accelerometer).
+# Everything stays in small ints (no heap-allocated floats) until the end:
+# both sensors are brought to Q10 (1024 = NORMALIZATION_RANGE_G), summed
+# (the 1/2 of the average cancels out in the unit-length scaling), and
+# scaled to a unit vector in Q14 (16384 = 1.0).
+#   internal raw: 32 = range  -> Q10 = raw << 5
+#   external raw: 32768 = range (16384/g) -> Q10 = raw >> 5
+_Q14_ONE = 1 << 14
+_INV_Q14 = 1.0 / _Q14_ONE
+
+
+@micropython.native
+def _fuse_fixed(ix, iy, iz, ex, ey, ez):
+    """Integer version of _fuse: Q10 sum, unit vector in Q14."""
+    ax = (ix << 5) + (ex >> 5)
+    ay = (iy << 5) + (ey >> 5)
+    az = (iz << 5) + (ez >> 5)
+    mag = ax * ax + ay * ay + az * az
+    if mag == 0:
+        return (0, 0, 0)
+    # Integer square root (Newton's method)
+    r = mag
+    y = (r + 1) >> 1
+    while y < r:
+        r = y
+        y = (r + mag // r) >> 1
+    return (ax * _Q14_ONE // r, ay * _Q14_ONE // r, az * _Q14_ONE // r)
+
+
+async def get_averaged_accel_data_fixed_async(internal_read, external_mpu):
+    """
+    Same result as get_averaged_accel_data_async, for the raw internal
+    accelerometer, computed in fixed point. Converts to float only on return.
+    """
+    if not external_mpu or not internal_read:
+        print("Error reading one or more sensors.")
+        return None
+    try:
+        ex, ey, ez = await external_mpu.get_accel_raw_async()
+        ix, iy, iz = internal_read()
+    except OSError as e:
+        print(f"Sensor read error: {e}")
+        return None
 
-    # 4. Average and Clamp
-    avg_x = max(-1.0, min(1.0, (int_norm_x + ext_norm_x) / 2.0))
-    avg_y = max(-1.0, min(1.0, (int_norm_y + ext_norm_y) / 2.0))
-    avg_z = max(-1.0, min(1.0, (int_norm_z + ext_norm_z) / 2.0))
+    qx, qy, qz = _fuse_fixed(ix, iy, iz, ex, ey, ez)
 
-    return {"norm_x": avg_x, "norm_y": avg_y, "norm_z": avg_z}
+    return (qx * _INV_Q14, qy * _INV_Q14, qz * _INV_Q14)
 
 
-# --- 5. Demonstration Task (Blinker) ---
+# --- 4. Background Tasks (Blinker, GC) ---
 
 
 async def blink_led(led, period_ms):
@@ -157,13 +221,32 @@ async def blink_led(led, period_ms):
         await uasyncio.sleep_ms(period_ms)
 
 
-# --- 6. Main Asynchronous Execution ---
+GC_PERIOD_MS = 2000
+
+
+async def gc_task(period_ms):
+    """
+    Collects garbage at a known cadence. Automatic collection is disabled
+    in main(), so GC pauses land here instead of in the middle of a read.
+    """
+    while True:
+        await uasyncio.sleep_ms(period_ms)
+        gc.collect()
+
+
+# --- 5. Main Asynchronous Execution ---
+
+# Pyboard pin wired to the MPU-6050 INT output, or None if not connected.
+# With it, the external read sleeps until the sensor has new data.
+MPU_INT_PIN = None  # e.g. "X11"
+
+FUSION_PERIOD_MS = 200
 
 
 async def main():
     """Main coroutine to set up and run all tasks."""
     print("Initializing all sensors...")
-    internal_accel = None
+    internal_read = None
     external_mpu = None
     has_filtered_method = False
 
@@ -171,6 +254,13 @@ async def main():
         # 1. Init Internal Sensor
         internal_accel = pyb.Accel()
         has_filtered_method = hasattr(internal_accel, "filtered_xyz")
+        # The board type is fixed: decide the reader (and factor) once
+        if has_filtered_method:
+            internal_read = internal_accel.filtered_xyz
+            int_inv_norm = _INV_AVG_G
+        else:
+            # Raw ints, handled by the fixed-point path (no float factor)
+            internal_read = internal_accel.xyz
         print("Internal accelerometer initialized.")
 
         # 2. Init External Sensor
@@ -178,9 +268,16 @@ async def main():
         devices = i2c.scan()
         if MPU6050.DEFAULT_ADDR not in devices:
             raise OSError("MPU-6050 not found at 0x68.")
-        external_mpu = MPU6050(i2c)
+        external_mpu = MPU6050(i2c, int_pin=MPU_INT_PIN)
         print("External MPU-6050 initialized.")
 
+        # 3. Average a window of external samples when ulab is available
+        # (the window pre-fill reads the sensor, so it belongs in init)
+        external_src = external_mpu
+        if has_filtered_method and np is not None and ACCEL_WINDOW > 1:
+            external_src = AccelWindow(external_mpu, ACCEL_WINDOW)
+            print(f"Averaging {ACCEL_WINDOW} external samples per output (ulab).")
+
     except Exception as e:
         print(f"FATAL ERROR during initialization: {e}")
         return
@@ -194,23 +291,38 @@ async def main():
     led = pyb.LED(1)  # LED 1 is RED on most Pyboards
     uasyncio.create_task(blink_led(led, 500))
 
+    # Schedule GC ourselves (no automatic collections during sensor reads)
+    gc.collect()
+    gc.disable()
+    uasyncio.create_task(gc_task(GC_PERIOD_MS))
+
+    # Pick the fusion path once for this board
+    if has_filtered_method:
+        if external_src is not external_mpu:
+            uasyncio.create_task(external_src.run(FUSION_PERIOD_MS // ACCEL_WINDOW))
+
+        def read_fused():
+            return get_averaged_accel_data_async(
+                internal_read, int_inv_norm, external_src, _INV_AVG_G
+            )
+
+    else:
+        # Pyboard v1.x: raw integer internal data, fixed-point fusion
+        def read_fused():
+            return get_averaged_accel_data_fixed_async(internal_read, external_mpu)
+
     # Run the main fusion loop
     while True:
-        # Call our new async fusion function
-        fused_data = await get_averaged_accel_data_async(
-            internal_accel, has_filtered_method, external_mpu
-        )
+        # Call our async fusion function
+        fused_data = await read_fused()
 
         if fused_data:
-            print(
-                f"Fused Norm: X={fused_data['norm_x']: .3f} | "
-                f"Y={fused_data['norm_y']: .3f} | "
-                f"Z={fused_data['norm_z']: .3f}"
-            )
+            # One %-format of the tuple: no f-string parsing or key lookups
+            print("Fused Norm: %7.3f %7.3f %7.3f" % fused_data)
 
         # This is the cooperative sleep.
         # While this task is sleeping, the blink_led task will run.
-        await uasyncio.sleep_ms(200)
+        await uasyncio.sleep_ms(FUSION_PERIOD_MS)
 
 
 # --- Run the Event Loop ---
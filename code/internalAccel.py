@@ -1,5 +1,5 @@
 import pyb
-import time
+import uasyncio
 
 # --- 1. Initialize the Internal Accelerometer ---
 
@@ -65,42 +65,49 @@ def getInternalAccelerometerData():
     return data
 
 
-# --- 3. Main Execution (Example Usage) ---
+# --- 3. Asynchronous Read Loop ---
+# Yields to the scheduler between polls, so other tasks (the external
+# MPU-6050, motor control, ...) can share the same event loop.
+
+
+async def read_loop():
+    while True:
+        # Call your function to get the data
+        sensor_data = getInternalAccelerometerData()
+
+        if sensor_data:
+            units = sensor_data["units"]
+
+            # Format the output based on the data type
+            if units == "g-force":
+                # Print nicely formatted floats for g-force
+                print(
+                    f"Accel ({units}): X={sensor_data['accel_x']:.2f}, "
+                    f"Y={sensor_data['accel_y']:.2f}, "
+                    f"Z={sensor_data['accel_z']:.2f}"
+                )
+            else:
+                # Print left-aligned integers for raw values
+                print(
+                    f"Accel ({units}): X={sensor_data['accel_x']:<4}, "
+                    f"Y={sensor_data['accel_y']:<4}, "
+                    f"Z={sensor_data['accel_z']:<4}"
+                )
+
+            # Print the tilt register
+            print(f"Tilt Register: {sensor_data['tilt']}")
+            print("-" * 40)
+
+        await uasyncio.sleep_ms(500)  # Poll twice per second
+
+
+# --- 4. Main Execution (Example Usage) ---
 
 if accel:
     print("\nReading data... Press Ctrl+C to stop.")
     print("-" * 40)
 
-    while True:
-        try:
-            # Call your function to get the data
-            sensor_data = getInternalAccelerometerData()
-
-            if sensor_data:
-                units = sensor_data["units"]
-
-                # Format the output based on the data type
-                if units == "g-force":
-                    # Print nicely formatted floats for g-force
-                    print(
-                        f"Accel ({units}): X={sensor_data['accel_x']:.2f}, "
-                        f"Y={sensor_data['accel_y']:.2f}, "
-                        f"Z={sensor_data['accel_z']:.2f}"
-                    )
-                else:
-                    # Print left-aligned integers for raw values
-                    print(
-                        f"Accel ({units}): X={sensor_data['accel_x']:<4}, "
-                        f"Y={sensor_data['accel_y']:<4}, "
-                        f"Z={sensor_data['accel_z']:<4}"
-                    )
-
-                # Print the tilt register
-                print(f"Tilt Register: {sensor_data['tilt']}")
-                print("-" * 40)
-
-            time.sleep_ms(500)  # Poll twice per second
-
-        except KeyboardInterrupt:
-            print("\nProgram stopped.")
-            break
+    try:
+        uasyncio.run(read_loop())
+    except KeyboardInterrupt:
+        print("\nProgram stopped.")
@@ -0,0 +1,15 @@
+# Frozen-module manifest for a custom Pyboard firmware.
+# Freezing the shared MPU-6050 driver as bytecode skips parsing/compiling it
+# at boot and keeps the class in flash instead of the GC heap.
+#
+# Build (from the MicroPython source tree):
+#   cd ports/stm32
+#   make BOARD=PYBV11 FROZEN_MANIFEST=/path/to/pancake-robot/code/manifest.py
+#
+# Then only the scripts (asincroAccel.py, externalAccel.py, ...) need to be
+# copied to the board; `from mpu6050 import MPU6050` finds the frozen module.
+
+include("$(PORT_DIR)/boards/manifest.py")
+
+# Paths are relative to this file's directory
+freeze(".", "mpu6050.py")
@@ -12,15 +12,31 @@ import time
 PWM_FREQ = 20000
 tim = pyb.Timer(2, freq=PWM_FREQ)
 
+# Pulse width (in timer ticks) for each speed percentage 0..100.
+# Computed once, so a motor update is a table lookup instead of a
+# percentage conversion on every call.
+# period() is the auto-reload value (ARR); duty = width / (ARR + 1), so the
+# table scales by PERIOD + 1 (same as pulse_width_percent, 100% = full on).
+PERIOD = tim.period()
+LUT = tuple(((PERIOD + 1) * i) // 100 for i in range(101))
+
 # AIN1 (e.g., Pyboard Pin X1)
 in1_pin = pyb.Pin("X1")
 pwm_in1 = tim.channel(1, pyb.Timer.PWM, pin=in1_pin)
-pwm_in1.pulse_percent(0)
+pwm_in1.pulse_width(0)
 
 # AIN2 (e.g., Pyboard Pin X2)
 in2_pin = pyb.Pin("X2")
 pwm_in2 = tim.channel(2, pyb.Timer.PWM, pin=in2_pin)
-pwm_in2.pulse_percent(0)
+pwm_in2.pulse_width(0)
+
+# Bound setters, so each motor update skips the attribute lookups
+set1 = pwm_in1.pulse_width
+set2 = pwm_in2.pulse_width
+
+# Last pulse widths written to (AIN1, AIN2); -1 forces the first write.
+# Unchanged channels (e.g. successive stops) skip the timer register write.
+_last = [-1, -1]
 
 
 def motorControl(speed, direction):
@@ -28,39 +44,41 @@ def motorControl(speed, direction):
     Controls a single DC motor connected to the DRV8833 (HW-626) module.
 
     Args:
-        speed (int): Speed percentage (0 to 100).
+        speed (int): Speed percentage (0 to 100). Floats are truncated.
         direction (int):
              1: Forward
             -1: Reverse
-             0: Stop (Brake/Stop)
+             0: Stop (Brake/Stop); any other value also stops
     """
 
     # Clamp the speed value to be between 0 and 100
-    if speed < 0:
-        speed = 0
-    if speed > 100:
-        speed = 100
-
-    if direction == 1:
-        # FORWARD: AIN1 = PWM (Speed), AIN2 = LOW (0%)
-        # The PWM pin controls the speed, the other pin determines direction.
-        pwm_in1.pulse_percent(speed)
-        pwm_in2.pulse_percent(0)
-    elif direction == -1:
-        # REVERSE: AIN1 = LOW (0%), AIN2 = PWM (Speed)
-        pwm_in1.pulse_percent(0)
-        pwm_in2.pulse_percent(speed)
-    else:  # direction == 0
-        # STOP (Brake): AIN1 = LOW, AIN2 = LOW
-        # This shorts the motor terminals, providing a quick stop (Brake).
-        pwm_in1.pulse_percent(0)
-        pwm_in2.pulse_percent(0)
-
-        # Alternative: STOP (Coast - Freewheel) - Requires setting both to HIGH
-        # Setting both HIGH is the other way to brake. Setting both LOW or HIGH
-        # results in braking/coasting depending on the chip configuration.
-        # pwm_in1.pulse_percent(100)
-        # pwm_in2.pulse_percent(100)
+    speed = int(speed)
+    speed = 0 if speed < 0 else (100 if speed > 100 else speed)
+    w = LUT[speed]
+
+    # Anything that is not forward/reverse brakes, as a stop is the safe default
+    if direction != 1 and direction != -1:
+        direction = 0
+
+    # (AIN1, AIN2) pulse widths, indexed by direction + 1:
+    # REVERSE: AIN1 = LOW (0%), AIN2 = PWM (Speed)
+    # STOP (Brake): AIN1 = LOW, AIN2 = LOW
+    #   This shorts the motor terminals, providing a quick stop (Brake).
+    # FORWARD: AIN1 = PWM (Speed), AIN2 = LOW (0%)
+    #   The PWM pin controls the speed, the other pin determines direction.
+    a, b = ((0, w), (0, 0), (w, 0))[direction + 1]
+    if _last[0] != a:
+        set1(a)
+        _last[0] = a
+    if _last[1] != b:
+        set2(b)
+        _last[1] = b
+
+    # Alternative: STOP (Coast - Freewheel) - Requires setting both to HIGH
+    # Setting both HIGH is the other way to brake. Setting both LOW or HIGH
+    # results in braking/coasting depending on the chip configuration.
+    # pwm_in1.pulse_width(LUT[100])
+    # pwm_in2.pulse_width(LUT[100])
 
 
 # --- Example Usage (Same as before, but using DRV8833 logic) ---
@@ -0,0 +1,196 @@
+import pyb
+import time
+import struct
+from array import array
+import uasyncio
+
+# Register values written at init, built once at module level
+_WAKE = b"\x00"  # PWR_MGMT_1: clear SLEEP, internal 8 MHz clock
+_DLPF_184HZ = b"\x01"  # CONFIG: DLPF on -> 1 kHz internal sample rate
+_DIV_50HZ = b"\x13"  # SMPLRT_DIV: 1 kHz / (1 + 19) = 50 Hz
+_DATA_RDY_EN = b"\x01"  # INT_ENABLE: data-ready interrupt
+
+
+# --- A Minimal MPU-6050 Driver Class ---
+# This class handles the I2C communication and data conversion.
+# Shared by externalAccel.py and asincroAccel.py, and frozen into the
+# firmware through manifest.py.
+#
+class MPU6050:
+    """A minimal driver for the MPU-6050 IMU."""
+
+    # Default I2C address
+    DEFAULT_ADDR = 0x68
+
+    # Internal register addresses
+    REG_SMPLRT_DIV = 0x19
+    REG_CONFIG = 0x1A
+    REG_INT_ENABLE = 0x38
+    REG_ACCEL_X_H = 0x3B
+    REG_TEMP_H = 0x41
+    REG_GYRO_X_H = 0x43
+    REG_PWR_MGMT_1 = 0x6B
+
+    # Scaling factors for default settings (±2g, ±250dps)
+    # 16-bit signed int (65536 total values)
+    # Accel: 65536 / 4g (from -2g to +2g) = 16384 LSB/g
+    # Gyro:  65536 / 500dps (from -250 to +250) = 131.072 LSB/dps
+    SCALE_ACCEL = 16384.0
+    SCALE_GYRO = 131.0
+
+    # Inverse factors, so each read multiplies instead of dividing
+    # (float division is far slower than multiplication on the MCU)
+    _INV_ACCEL = 1.0 / SCALE_ACCEL
+    _INV_GYRO = 1.0 / SCALE_GYRO
+    _INV_TEMP = 1.0 / 340.0
+
+    # Burst-read layout: 7 values, '>' big-endian, 'h' signed 16-bit integer
+    _FMT = ">hhhhhhh"
+    _FMT_ACCEL = ">hhh"  # Only the first 3 words (Accel X, Y, Z)
+
+    def __init__(self, i2c_bus, addr=DEFAULT_ADDR, int_pin=None):
+        self.i2c = i2c_bus
+        self.addr = addr
+        self._buffer = bytearray(14)
+
+        # Output buffer, reused on every read so polling does not allocate
+        self._out = array("f", [0] * 7)
+
+        # Bind the read/unpack methods once, so each read skips the lookups
+        self._read = self.i2c.readfrom_mem_into
+        self._unpack = struct.unpack_from
+
+        # Set by the data-ready IRQ (only if the INT pin is wired)
+        self.has_int_pin = int_pin is not None
+        self._ready = None
+
+        try:
+            # Wake the sensor up - it starts in sleep mode
+            # We do this by writing 0 to the Power Management 1 register
+            self.i2c.writeto_mem(self.addr, self.REG_PWR_MGMT_1, _WAKE)
+            time.sleep_ms(100)  # Wait for sensor to stabilize
+            if int_pin is not None:
+                self._enable_data_ready(int_pin)
+        except OSError as e:
+            print(f"Failed to init MPU6050: {e}")
+            raise
+
+    def _enable_data_ready(self, int_pin):
+        """Routes the sensor's data-ready interrupt (INT pin) to a flag."""
+        self._ready = uasyncio.ThreadSafeFlag()
+        # DLPF on -> 1 kHz internal rate; 1 kHz / (1 + 19) = 50 Hz data-ready
+        self.i2c.writeto_mem(self.addr, self.REG_CONFIG, _DLPF_184HZ)
+        self.i2c.writeto_mem(self.addr, self.REG_SMPLRT_DIV, _DIV_50HZ)
+        self.i2c.writeto_mem(self.addr, self.REG_INT_ENABLE, _DATA_RDY_EN)
+        self._irq = pyb.ExtInt(
+            int_pin, pyb.ExtInt.IRQ_RISING, pyb.Pin.PULL_NONE, self._on_data_ready
+        )
+
+    def _on_data_ready(self, line):
+        # Hard IRQ context: only signal the waiting task
+        self._ready.set()
+
+    def _read_signed_word(self, high_byte, low_byte):
+        """Combines two bytes into a 16-bit signed integer."""
+        value = (high_byte << 8) | low_byte
+        # Check if the highest bit (sign bit) is set
+        if value >= 0x8000:
+            return value - 0x10000  # Convert to negative (two's complement)
+        else:
+            return value
+
+    def read_raw_into(self, buf):
+        """
+        Burst-reads the 14 raw bytes (7 big-endian int16 words, same
+        layout as get_all_data_scaled) into buf, e.g. one slot of a
+        sample ring. No scaling is done here.
+        """
+        self._read(self.addr, self.REG_ACCEL_X_H, buf)
+
+    async def wait_data_ready(self):
+        """Sleeps until new data is ready (if INT is wired), else yields."""
+        if self._ready is not None:
+            await self._ready.wait()
+        else:
+            await uasyncio.sleep_ms(0)
+
+    def get_all_data_scaled(self):
+        """
+        Reads all 14 bytes of data (Accel, Temp, Gyro) at once
+        and returns them as scaled, physical values.
+
+        The values are written into a preallocated array which is
+        returned: (ax, ay, az, temp_c, gx, gy, gz). The same array is
+        overwritten by the next read.
+        """
+        try:
+            # Read 14 bytes starting from the Accel X H register (0x3B)
+            # This block contains:
+            # 0x3B-3C: Accel X
+            # 0x3D-3E: Accel Y
+            # 0x3F-40: Accel Z
+            # 0x41-42: Temp
+            # 0x43-44: Gyro X
+            # 0x45-46: Gyro Y
+            # 0x47-48: Gyro Z
+            # This is a synchronous (blocking) I2C read
+            buf = self._buffer
+            self._read(self.addr, self.REG_ACCEL_X_H, buf)
+
+            # Unpack all 7 values (14 bytes) at once.
+            ax_raw, ay_raw, az_raw, temp_raw, gx_raw, gy_raw, gz_raw = self._unpack(
+                self._FMT, buf
+            )
+
+            # --- Apply scaling factors ---
+
+            out = self._out
+
+            # Accelerometer data in g-force
+            inv_accel = self._INV_ACCEL
+            out[0] = ax_raw * inv_accel
+            out[1] = ay_raw * inv_accel
+            out[2] = az_raw * inv_accel
+
+            # Temperature data in degrees Celsius
+            # Formula from datasheet: (TEMP_OUT / 340) + 36.53
+            out[3] = (temp_raw * self._INV_TEMP) + 36.53
+
+            # Gyroscope data in degrees per second (dps)
+            inv_gyro = self._INV_GYRO
+            out[4] = gx_raw * inv_gyro
+            out[5] = gy_raw * inv_gyro
+            out[6] = gz_raw * inv_gyro
+
+            return out
+
+        except OSError as e:
+            print(f"I2C Error reading sensor: {e}")
+            out = self._out
+            for i in range(7):
+                out[i] = 0
+            return out
+
+    def get_accel_raw(self):
+        """
+        Returns the raw accelerometer counts (ax, ay, az) as ints
+        (SCALE_ACCEL = 16384 per g), for integer-only processing.
+        Raises OSError on I2C failure.
+        """
+        buf = self._buffer
+        self._read(self.addr, self.REG_ACCEL_X_H, buf)
+        return self._unpack(self._FMT_ACCEL, buf)
+
+    async def get_accel_raw_async(self):
+        """Like get_accel_raw, after waiting for new data (see below)."""
+        await self.wait_data_ready()
+        return self.get_accel_raw()
+
+    async def get_all_data_scaled_async(self):
+        """
+        Sleeps until the sensor signals new data (if INT is wired),
+        then reads it. Other tasks run while waiting.
+        Without an INT pin it just yields once before the read.
+        """
+        await self.wait_data_ready()
+        return self.get_all_data_scaled()